@@ -0,0 +1,61 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+PRIMARY_DB = "default"
+
+# Per-request routing state, only set inside replica_reads(): "replica" is the
+# alias chosen for the whole block (None without replicas), and "pinned" flips
+# to True on the first write so later reads see that write.
+_routing_state: ContextVar[dict | None] = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Allow reads inside the block (or decorated view) to go to a replica.
+
+    One replica is picked when the block starts and serves every read in it,
+    so a request sees a single, consistent snapshot. Reads outside this block
+    always use the primary database. Used as a decorator, each call gets its
+    own context manager, so concurrent requests never share routing state.
+    """
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    replica = random.choice(replicas) if replicas else None
+    token = _routing_state.set({"replica": replica, "pinned": False})
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+def pin_to_primary():
+    state = _routing_state.get()
+    if state is not None:
+        state["pinned"] = True
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to the block's replica when allowed, everything else to "default".
+
+    Once a write happens inside a replica_reads() block, the rest of that
+    block reads from the primary (read-your-writes).
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or state["pinned"] or state["replica"] is None:
+            return PRIMARY_DB
+        return state["replica"]
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
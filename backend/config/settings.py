@@ -67,6 +67,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "config.middleware.APICompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -99,19 +100,23 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+def database_from_url(url: str) -> dict:
+    parsed = urlparse(url)
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": parsed.path.lstrip("/"),
+        "USER": parsed.username,
+        "PASSWORD": parsed.password,
+        "HOST": parsed.hostname,
+        "PORT": parsed.port or "5432",
+    }
+
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL:
-    parsed = urlparse(DATABASE_URL)
     DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": parsed.path.lstrip("/"),
-            "USER": parsed.username,
-            "PASSWORD": parsed.password,
-            "HOST": parsed.hostname,
-            "PORT": parsed.port or "5432",
-        }
+        "default": database_from_url(DATABASE_URL),
     }
 else:
     DATABASES = {
@@ -121,6 +126,46 @@ else:
         }
     }
 
+# Read replicas (comma-separated URLs). Safe reads from the ticket/user/me
+# endpoints are spread across them; everything else stays on "default".
+# See config/db_router.py.
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(env_list("DATABASE_REPLICA_URLS"), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **database_from_url(replica_url),
+        # Tests run against the primary test database only.
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["config.db_router.PrimaryReplicaRouter"]
+
+# Switch the Ticket admin to estimated counts and index-backed search/filters
+# (tickets.admin.LargeTableTicketAdmin). Meant for tables with 1M+ rows.
+ADMIN_LARGE_TABLES = env_bool("ADMIN_LARGE_TABLES", default=False)
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# API throttling keeps its token buckets here. The local-memory fallback is
+# per process, so deployments with several workers should set REDIS_URL.
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
 
 
 # Password validation
@@ -161,6 +206,9 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
+# Smallest /api/ response body (bytes) worth compressing with brotli/gzip.
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+
 # -----------------------------------------------------------------------------
 # Default primary key field type
 # -----------------------------------------------------------------------------
@@ -196,6 +244,27 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Token buckets: "N/period" allows bursts of N, refilled at N per period.
+    # "token" and "tickets" are per-endpoint scopes (view.throttle_scope).
+    # "token_all" is one bucket shared by every client of the token endpoint,
+    # capping password hashing no matter how many IPs the requests come from.
+    "DEFAULT_THROTTLE_CLASSES": (
+        "tickets.throttling.IPTokenBucketThrottle",
+        "tickets.throttling.UserTokenBucketThrottle",
+        "tickets.throttling.ScopedTokenBucketThrottle",
+        "tickets.throttling.EndpointTokenBucketThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "ip": os.getenv("THROTTLE_RATE_IP", "600/min"),
+        "user": os.getenv("THROTTLE_RATE_USER", "300/min"),
+        "token": os.getenv("THROTTLE_RATE_TOKEN", "10/min"),
+        "token_all": os.getenv("THROTTLE_RATE_TOKEN_ALL", "120/min"),
+        "tickets": os.getenv("THROTTLE_RATE_TICKETS", "120/min"),
+    },
+    # Trusted proxies in front of the app. The client IP is taken from
+    # X-Forwarded-For only when this is > 0; 0 uses REMOTE_ADDR, so clients
+    # can't pick their own throttle bucket by sending the header.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 SIMPLE_JWT = {
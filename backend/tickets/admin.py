@@ -1,8 +1,14 @@
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
 from .models import Ticket
+from .pagination import EstimatedCountPaginator
+
+User = get_user_model()
 
 
-@admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
     list_display = (
         "id",
@@ -15,6 +21,8 @@ class TicketAdmin(admin.ModelAdmin):
         "updated_at",
     )
     list_display_links = ("id", "title")
+    # assignee is nullable, so the admin's default select_related() skips it.
+    list_select_related = ("requester", "assignee")
     list_filter = ("status", "priority", "created_at", "updated_at")
     search_fields = (
         "title",
@@ -40,4 +48,47 @@ class TicketAdmin(admin.ModelAdmin):
         ("Timestamps", {
             "fields": ("created_at", "updated_at")
         }),
-    )
\ No newline at end of file
+    )
+
+
+class LargeTableTicketAdmin(TicketAdmin):
+    """
+    Ticket changelist for very large tables (enabled by ADMIN_LARGE_TABLES).
+
+    - estimated row counts instead of COUNT(*), and no second unfiltered count
+    - search on title/description through the trigram indexes, and on
+      usernames via an exact match resolved to user ids first
+    - status/priority filters and the created_at drill-down each served by
+      an index that also covers the default -created_at ordering
+    - sorting only on indexed columns (id, created_at)
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = "admin/tickets/ticket/change_list_large.html"
+
+    list_filter = ("status", "priority", "created_at")
+    search_fields = ("title", "description", "=requester__username", "=assignee__username")
+    search_help_text = "Title or description contains the text, or exact requester/assignee username."
+    date_hierarchy = "created_at"
+    sortable_by = ("id", "created_at")
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        query = Q(title__icontains=search_term) | Q(description__icontains=search_term)
+        user_ids = list(
+            User.objects.using(queryset.db)
+            .filter(username__iexact=search_term)
+            .values_list("pk", flat=True)
+        )
+        if user_ids:
+            query |= Q(requester_id__in=user_ids) | Q(assignee_id__in=user_ids)
+        return queryset.filter(query), False
+
+
+admin.site.register(
+    Ticket, LargeTableTicketAdmin if settings.ADMIN_LARGE_TABLES else TicketAdmin
+)
@@ -20,3 +20,6 @@ class UsernameOrEmailTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 class UsernameOrEmailTokenObtainPairView(TokenObtainPairView):
     serializer_class = UsernameOrEmailTokenObtainPairSerializer
+    # Each attempt runs a password hash; keep floods from pinning the CPU.
+    throttle_scope = "token"
+    endpoint_throttle_scope = "token_all"
@@ -0,0 +1,174 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import RequestFactory
+from django.utils import timezone
+
+from tickets.admin import LargeTableTicketAdmin, TicketAdmin
+from tickets.models import Ticket
+
+User = get_user_model()
+
+BENCH_USERNAME = "bench-admin"
+LOCAL_HOSTS = {"", "localhost", "127.0.0.1", "::1"}
+
+
+@contextmanager
+def manual_timestamps():
+    """Let bulk_create keep the created_at/updated_at values we generate."""
+    fields = [Ticket._meta.get_field("created_at"), Ticket._meta.get_field("updated_at")]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bench_admin(admin_class, database):
+    """An admin_class instance whose changelist reads from `database`."""
+
+    class BenchAdmin(admin_class):
+        def get_queryset(self, request):
+            return super().get_queryset(request).using(database)
+
+    return BenchAdmin(Ticket, admin.site)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Ticket admin changelist render time (TicketAdmin vs "
+        "LargeTableTicketAdmin). Creates --tickets rows and bench users in "
+        "--database, and deletes them again afterwards. Needs --write-data, "
+        "and refuses a remote or non-empty database unless --force is given; "
+        "point --database at a dedicated PostgreSQL database for meaningful "
+        "numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tickets", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--write-data",
+            action="store_true",
+            help="Confirm that the command may create (and then delete) rows in --database.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Allow a database that is not local or already has tickets.",
+        )
+
+    def handle(self, *args, **options):
+        database = options["database"]
+        self.check_database(database, options["write_data"], options["force"])
+
+        users = User.objects.db_manager(database)
+        # No usable password: the account only exists for RequestFactory requests.
+        user = users.create_superuser(username=BENCH_USERNAME, email="", password=None)
+        agents = [
+            users.create_user(username=f"{BENCH_USERNAME}-agent{i}", password=None)
+            for i in range(1, 20)
+        ]
+        try:
+            self.fill_tickets(database, options["tickets"], options["batch_size"], [user, *agents])
+            self.run_scenarios(database, user, options["repeat"])
+        finally:
+            self.stdout.write("Removing bench tickets and users...")
+            Ticket.objects.using(database).filter(requester__in=[user, *agents]).delete()
+            users.filter(pk__in=[u.pk for u in (user, *agents)]).delete()
+
+    def check_database(self, database, write_data, force):
+        if not write_data:
+            raise CommandError(
+                f"This command writes up to --tickets rows to the {database!r} database. "
+                "Pass --write-data to confirm."
+            )
+
+        connection = connections[database]
+        host = connection.settings_dict.get("HOST") or ""
+        if connection.vendor != "sqlite" and host not in LOCAL_HOSTS and not force:
+            raise CommandError(
+                f"Database {database!r} is on {host!r}, not a local server. "
+                "Use a dedicated local database, or pass --force."
+            )
+        if Ticket.objects.using(database).exists() and not force:
+            raise CommandError(f"Database {database!r} already has tickets. Use an empty one, or pass --force.")
+        if User.objects.using(database).filter(username=BENCH_USERNAME).exists():
+            raise CommandError(f"User {BENCH_USERNAME!r} already exists in {database!r}; remove it first.")
+
+    def run_scenarios(self, database, user, repeat):
+        newest = (
+            Ticket.objects.using(database)
+            .order_by("-created_at")
+            .values_list("created_at", flat=True)
+            .first()
+        )
+        scenarios = {
+            "first page": {},
+            "page 50": {"p": "50"},
+            "search": {"q": "outage"},
+            "search username": {"q": user.username},
+            "status filter": {"status__exact": Ticket.Status.OPEN},
+            "year drill-down": {"created_at__year": str(newest.year)} if newest else {},
+        }
+
+        factory = RequestFactory()
+        for admin_class in (TicketAdmin, LargeTableTicketAdmin):
+            model_admin = bench_admin(admin_class, database)
+            self.stdout.write(self.style.MIGRATE_HEADING(admin_class.__name__))
+            for label, params in scenarios.items():
+                timings = []
+                for _ in range(repeat):
+                    request = factory.get("/admin/tickets/ticket/", params)
+                    request.user = user
+                    start = time.perf_counter()
+                    model_admin.changelist_view(request).render()
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f"  {label:<18} median {statistics.median(timings):8.1f} ms"
+                    f"   max {max(timings):8.1f} ms"
+                )
+
+    def fill_tickets(self, database, count, batch_size, users):
+        self.stdout.write(f"Creating {count} tickets...")
+        statuses = [choice for choice, _ in Ticket.Status.choices]
+        priorities = [choice for choice, _ in Ticket.Priority.choices]
+        words = ["fiber", "outage", "latency", "router", "ONT", "PPP", "packet", "loss", "GPON", "drop"]
+        now = timezone.now()
+
+        missing = count
+        with manual_timestamps():
+            while missing > 0:
+                batch = []
+                for _ in range(min(batch_size, missing)):
+                    created_at = now - timedelta(minutes=random.randint(0, 3 * 365 * 24 * 60))
+                    batch.append(Ticket(
+                        title=" ".join(random.sample(words, 4)),
+                        description=" ".join(random.choices(words, k=30)),
+                        status=random.choice(statuses),
+                        priority=random.choice(priorities),
+                        requester=random.choice(users),
+                        assignee=random.choice([None, *users]),
+                        created_at=created_at,
+                        updated_at=created_at,
+                    ))
+                Ticket.objects.using(database).bulk_create(batch)
+                missing -= len(batch)
+
+        connection = connections[database]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(Ticket._meta.db_table)}")
+        self.stdout.write(self.style.SUCCESS(f"Tickets in table: {Ticket.objects.using(database).count()}"))
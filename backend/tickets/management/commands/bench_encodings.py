@@ -0,0 +1,84 @@
+import gzip
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from config.middleware import APICompressionMiddleware, brotli
+from tickets.models import Ticket
+from tickets.renderers import MessagePackRenderer
+from tickets.serializers import TicketSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare payload size and encode time of a ticket list response for "
+        "JSONRenderer vs MessagePackRenderer, raw and compressed. Uses "
+        "in-memory tickets, so no database rows are needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tickets", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        data = TicketSerializer(self.build_tickets(options["tickets"]), many=True).data
+        self.stdout.write(f"{options['tickets']} tickets\n")
+        self.stdout.write(f"{'encoding':<22}{'bytes':>12}{'encode ms':>12}")
+
+        for renderer in (JSONRenderer(), MessagePackRenderer()):
+            name = type(renderer).__name__
+            body, encode_ms = self.measure(options["repeat"], renderer.render, data)
+            self.report(name, body, encode_ms)
+
+            compressed, ms = self.measure(options["repeat"], gzip.compress, body, 6)
+            self.report("  + gzip", compressed, encode_ms + ms)
+            if brotli is not None:
+                quality = APICompressionMiddleware.brotli_quality
+                compressed, ms = self.measure(
+                    options["repeat"], lambda b: brotli.compress(b, quality=quality), body
+                )
+                self.report(f"  + brotli (q={quality})", compressed, encode_ms + ms)
+
+    def report(self, label, body, ms):
+        self.stdout.write(f"{label:<22}{len(body):>12,}{ms:>12.1f}")
+
+    @staticmethod
+    def measure(repeat, func, *args):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(*args)
+            timings.append((time.perf_counter() - start) * 1000)
+        return result, statistics.median(timings)
+
+    @staticmethod
+    def build_tickets(count):
+        users = [User(pk=pk, username=f"agent{pk}") for pk in range(1, 21)]
+        words = ["fiber", "outage", "latency", "router", "ONT", "PPP", "packet", "loss", "GPON", "drop"]
+        statuses = [choice for choice, _ in Ticket.Status.choices]
+        priorities = [choice for choice, _ in Ticket.Priority.choices]
+        now = timezone.now()
+
+        tickets = []
+        for pk in range(1, count + 1):
+            created_at = now - timedelta(seconds=random.randint(0, 365 * 24 * 3600))
+            tickets.append(Ticket(
+                pk=pk,
+                title=" ".join(random.sample(words, 4)),
+                description=" ".join(random.choices(words, k=20)),
+                status=random.choice(statuses),
+                priority=random.choice(priorities),
+                requester=random.choice(users),
+                assignee=random.choice([None, *users]),
+                created_at=created_at,
+                updated_at=created_at + timedelta(minutes=random.randint(0, 600)),
+            ))
+        return tickets
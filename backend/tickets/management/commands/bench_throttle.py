@@ -0,0 +1,89 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from tickets.throttling import TokenBucketThrottle
+from tickets.views import TicketViewSet
+
+User = get_user_model()
+
+BUDGET_MS = 1.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API throttle checks (all default throttle classes, "
+        "against the configured cache backend) for requests under and over "
+        "the limit. Keys go under their own prefix and are removed afterwards, "
+        "so live throttle buckets and metrics are left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        user = User(pk=1, username="bench-throttle")
+        cases = {
+            "under limit": "1000000/s",
+            "throttled": "1/d",
+        }
+
+        # Same backend as the app, but its own key space (and, for the local
+        # memory cache, its own store).
+        bench_caches = {
+            **settings.CACHES,
+            "default": {
+                **settings.CACHES["default"],
+                "KEY_PREFIX": "bench-throttle",
+                "LOCATION": settings.CACHES["default"].get("LOCATION", "bench-throttle"),
+            },
+        }
+
+        failed = False
+        for label, rate in cases.items():
+            rates = {scope: rate for scope in api_settings.DEFAULT_THROTTLE_RATES}
+            with override_settings(
+                CACHES=bench_caches,
+                REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates},
+            ):
+                keys = {TokenBucketThrottle.metrics_format % {"scope": scope} for scope in rates}
+                try:
+                    timings = self.run_checks(user, options["requests"], keys)
+                finally:
+                    caches["default"].delete_many(keys)
+
+            mean = statistics.fmean(timings)
+            p99 = statistics.quantiles(timings, n=100)[98]
+            ok = p99 < BUDGET_MS
+            failed = failed or not ok
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f"{label:<12} mean {mean * 1000:7.1f} us   p99 {p99 * 1000:7.1f} us"))
+
+        if failed:
+            self.stdout.write(self.style.ERROR(f"Throttle checks exceed {BUDGET_MS} ms per request"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Throttle checks stay under {BUDGET_MS} ms per request"))
+
+    @staticmethod
+    def run_checks(user, count, keys):
+        factory = APIRequestFactory()
+        view = TicketViewSet(action="list")
+        timings = []
+        for _ in range(count):
+            request = Request(factory.get("/api/tickets/"))
+            request.user = user
+            start = time.perf_counter()
+            throttles = [throttle_class() for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES]
+            for throttle in throttles:
+                throttle.allow_request(request, view)
+            timings.append((time.perf_counter() - start) * 1000)
+            keys.update(throttle.key for throttle in throttles if getattr(throttle, "key", None))
+        return timings
@@ -2,7 +2,10 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from config.db_router import replica_reads
 
+
+@replica_reads()
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def me(request):
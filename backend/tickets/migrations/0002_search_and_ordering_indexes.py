@@ -0,0 +1,86 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    """
+    CREATE INDEX CONCURRENTLY on PostgreSQL, so the ticket table stays
+    writable while the index builds. Other backends (SQLite in development
+    and tests) have no concurrent build and get a plain CREATE INDEX.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+# Trigram GIN indexes backing icontains search on PostgreSQL. Django renders
+# icontains as UPPER(col::text) LIKE UPPER(...), so the indexes are built on
+# that same expression, concurrently like the index above. Other backends
+# skip them.
+TRIGRAM_INDEXES = {
+    "ticket_title_trgm_idx": "title",
+    "ticket_description_trgm_idx": "description",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = schema_editor.quote_name(apps.get_model("tickets", "Ticket")._meta.db_table)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {schema_editor.quote_name(name)} ON {table} "
+            f"USING gin ((UPPER({schema_editor.quote_name(column)}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tickets", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="ticket",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="ticket_created_desc_idx"
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="ticket",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"], name="ticket_status_created_idx"
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="ticket",
+            index=models.Index(
+                fields=["priority", "-created_at", "-id"], name="ticket_priority_created_idx"
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -39,5 +39,14 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Default ordering for the API and admin changelist (admin adds -pk).
+            models.Index(fields=["-created_at", "-id"], name="ticket_created_desc_idx"),
+            # Same ordering within the admin's status/priority filters.
+            models.Index(fields=["status", "-created_at", "-id"], name="ticket_status_created_idx"),
+            models.Index(fields=["priority", "-created_at", "-id"], name="ticket_priority_created_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"#{self.id} {self.title}"
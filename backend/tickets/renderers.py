@@ -0,0 +1,26 @@
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Binary MessagePack output (`Accept: application/msgpack` or
+    `?format=msgpack`). Values JSON can't hold natively (datetimes, decimals,
+    UUIDs...) are converted the same way as in DRF's JSONRenderer.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        assert msgpack, "MessagePackRenderer requires msgpack to be installed"
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=JSONEncoder().default)
@@ -0,0 +1,93 @@
+import datetime
+
+from django import template
+from django.db.models import Max, Min
+from django.utils import formats, timezone
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+register = template.Library()
+
+
+@register.inclusion_tag("admin/date_hierarchy.html")
+def index_date_hierarchy(cl):
+    """
+    Same drill-down as admin's date_hierarchy, but the years/months/days are
+    built from MIN/MAX of the field (two index lookups) instead of a
+    SELECT DISTINCT date_trunc(...) over every matching row. Periods between
+    the first and last row are listed even if they happen to be empty.
+    """
+    field_name = cl.date_hierarchy
+    year_field = f"{field_name}__year"
+    month_field = f"{field_name}__month"
+    day_field = f"{field_name}__day"
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+
+    def link(filters):
+        return cl.get_query_string(filters, [f"{field_name}__"])
+
+    if year_lookup and month_lookup and day_lookup:
+        day = datetime.date(int(year_lookup), int(month_lookup), int(day_lookup))
+        return {
+            "show": True,
+            "back": {
+                "link": link({year_field: year_lookup, month_field: month_lookup}),
+                "title": capfirst(formats.date_format(day, "YEAR_MONTH_FORMAT")),
+            },
+            "choices": [{"title": capfirst(formats.date_format(day, "MONTH_DAY_FORMAT"))}],
+        }
+
+    date_range = cl.queryset.aggregate(first=Min(field_name), last=Max(field_name))
+    first, last = date_range["first"], date_range["last"]
+    if first is None or last is None:
+        return {"show": True, "back": None, "choices": []}
+    if timezone.is_aware(first):
+        first, last = timezone.localtime(first), timezone.localtime(last)
+
+    if not year_lookup and first.year == last.year:
+        year_lookup = first.year
+        if first.month == last.month:
+            month_lookup = first.month
+
+    if year_lookup and month_lookup:
+        year, month = int(year_lookup), int(month_lookup)
+        return {
+            "show": True,
+            "back": {"link": link({year_field: year_lookup}), "title": str(year_lookup)},
+            "choices": [
+                {
+                    "link": link({year_field: year_lookup, month_field: month_lookup, day_field: day}),
+                    "title": capfirst(
+                        formats.date_format(datetime.date(year, month, day), "MONTH_DAY_FORMAT")
+                    ),
+                }
+                for day in range(first.day, last.day + 1)
+            ],
+        }
+
+    if year_lookup:
+        year = int(year_lookup)
+        return {
+            "show": True,
+            "back": {"link": link({}), "title": _("All dates")},
+            "choices": [
+                {
+                    "link": link({year_field: year_lookup, month_field: month}),
+                    "title": capfirst(
+                        formats.date_format(datetime.date(year, month, 1), "YEAR_MONTH_FORMAT")
+                    ),
+                }
+                for month in range(first.month, last.month + 1)
+            ],
+        }
+
+    return {
+        "show": True,
+        "back": None,
+        "choices": [
+            {"link": link({year_field: str(year)}), "title": str(year)}
+            for year in range(first.year, last.year + 1)
+        ],
+    }
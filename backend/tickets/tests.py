@@ -1,3 +1,517 @@
-from django.test import TestCase
+import gzip
+import io
+import threading
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+import brotli
+import msgpack
+from django.contrib import admin
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.db_router import PrimaryReplicaRouter, _routing_state, replica_reads
+
+from .admin import LargeTableTicketAdmin
+from .models import Ticket
+from .pagination import EstimatedCountPaginator
+from .throttling import TAKE_TOKEN_LUA, TokenBucketThrottle, UserTokenBucketThrottle
+
+User = get_user_model()
+
+REPLICA = "replica_test"
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    @override_settings(DATABASE_REPLICAS=[REPLICA])
+    def test_reads_use_primary_outside_replica_block(self):
+        self.assertEqual(self.router.db_for_read(Ticket), "default")
+
+    @override_settings(DATABASE_REPLICAS=[REPLICA])
+    def test_reads_use_replica_inside_replica_block(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Ticket), REPLICA)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_use_primary_without_replicas(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Ticket), "default")
+
+    @override_settings(DATABASE_REPLICAS=[REPLICA])
+    def test_write_pins_rest_of_block_to_primary(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Ticket), "default")
+            self.assertEqual(self.router.db_for_read(Ticket), "default")
+
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Ticket), REPLICA)
+
+    @override_settings(DATABASE_REPLICAS=["replica_a", "replica_b"])
+    def test_block_reads_from_one_replica(self):
+        blocks = []
+        with mock.patch("config.db_router.random.choice", side_effect=["replica_a", "replica_b"]) as choice:
+            for _ in range(2):
+                with replica_reads():
+                    blocks.append({self.router.db_for_read(Ticket) for _ in range(10)})
+
+        self.assertEqual(blocks, [{"replica_a"}, {"replica_b"}])
+        self.assertEqual(choice.call_count, 2)
+
+    @override_settings(DATABASE_REPLICAS=[REPLICA])
+    def test_decorated_view_is_safe_across_overlapping_threads(self):
+        barrier = threading.Barrier(2)
+        results = {}
+
+        @replica_reads()
+        def view():
+            barrier.wait(timeout=5)
+            return self.router.db_for_read(Ticket)
+
+        def run(name):
+            try:
+                first = view()
+                results[name] = (first, view(), _routing_state.get())
+            except Exception as exc:
+                results[name] = exc
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {name: (REPLICA, REPLICA, None) for name in ("a", "b")})
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingApiTests(TestCase):
+    """
+    Runs the API against two databases: the test "default" database as the
+    primary and an in-memory SQLite database, registered only while this
+    class runs, as the replica.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = {
+            **connections.settings["default"],
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        }
+        call_command("migrate", database=REPLICA, verbosity=0)
+        # Set here rather than on the class so the test runner doesn't try
+        # to create a test database for an alias it doesn't know about.
+        cls.databases = {"default", REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username="staff", password="x", is_staff=True)
+        replica_staff = User.objects.db_manager(REPLICA).create_user(
+            pk=cls.staff.pk, username="staff", password="x", is_staff=True
+        )
+        Ticket.objects.create(title="from default", requester=cls.staff)
+        Ticket.objects.using(REPLICA).create(title=f"from {REPLICA}", requester=replica_staff)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_ticket_list_reads_from_replica(self):
+        response = self.client.get("/api/tickets/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t["title"] for t in response.data], [f"from {REPLICA}"])
+
+    def test_ticket_create_writes_to_primary(self):
+        response = self.client.post("/api/tickets/", {"title": "new"}, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Ticket.objects.using("default").filter(title="new").exists())
+        self.assertFalse(Ticket.objects.using(REPLICA).filter(title="new").exists())
+
+    def test_update_reads_and_writes_primary(self):
+        ticket = Ticket.objects.using("default").get()
+
+        response = self.client.patch(
+            f"/api/tickets/{ticket.id}/", {"status": "closed"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "from default")
+        self.assertEqual(Ticket.objects.using(REPLICA).get().status, "open")
+
+    def test_user_list_reads_from_replica(self):
+        User.objects.db_manager(REPLICA).create_user(username="replica-only")
+
+        response = self.client.get("/api/users/")
+
+        self.assertIn("replica-only", [u["username"] for u in response.data])
+
+    def test_me_loads_token_user_from_replica(self):
+        User.objects.using(REPLICA).filter(pk=self.staff.pk).update(email="replica@example.com")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.staff)}")
+
+        response = client.get("/api/me/")
+
+        self.assertEqual(response.data["email"], "replica@example.com")
+
+
+class LargeTableTicketAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(username="root", password="x")
+        cls.agent = User.objects.create_user(username="agent")
+        for title, assignee, created_at in [
+            ("Fiber outage", None, datetime(2024, 3, 5, tzinfo=timezone.utc)),
+            ("Router reboot", cls.agent, datetime(2025, 7, 9, tzinfo=timezone.utc)),
+        ]:
+            ticket = Ticket.objects.create(title=title, requester=cls.admin_user, assignee=assignee)
+            Ticket.objects.filter(pk=ticket.pk).update(created_at=created_at)
+
+    def changelist(self, **params):
+        request = RequestFactory().get("/admin/tickets/ticket/", params)
+        request.user = self.admin_user
+        response = LargeTableTicketAdmin(Ticket, admin.site).changelist_view(request)
+        return response.render()
+
+    def test_search_matches_title_and_exact_username(self):
+        by_title = self.changelist(q="outage").context_data["cl"]
+        by_user = self.changelist(q="AGENT").context_data["cl"]
+
+        self.assertEqual([t.title for t in by_title.result_list], ["Fiber outage"])
+        self.assertEqual([t.title for t in by_user.result_list], ["Router reboot"])
+
+    def test_date_hierarchy_lists_years_between_first_and_last(self):
+        response = self.changelist()
+
+        self.assertContains(response, "created_at__year=2024")
+        self.assertContains(response, "created_at__year=2025")
+        self.assertIsNone(response.context_data["cl"].full_result_count)
+
+    def test_date_hierarchy_drills_down_to_months_and_days(self):
+        months = self.changelist(created_at__year="2025")
+        response = self.changelist(created_at__year="2025", created_at__month="7")
+
+        self.assertContains(months, "created_at__month=7")
+        self.assertContains(response, "created_at__day=9")
+        self.assertEqual(response.context_data["cl"].result_count, 1)
+
+
+class EstimatedCountPaginatorTests(SimpleTestCase):
+    """Runs the PostgreSQL estimate paths against a mocked connection."""
+
+    def setUp(self):
+        self.connection = mock.MagicMock(vendor="postgresql")
+        patcher = mock.patch("tickets.pagination.connections", {"default": self.connection})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def count(self, queryset):
+        return EstimatedCountPaginator(queryset.order_by("-created_at"), 100).count
+
+    def test_unfiltered_count_uses_table_estimate(self):
+        cursor = self.connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (1_000_000,)
+
+        self.assertEqual(self.count(Ticket.objects.all()), 1_000_000)
+        self.assertEqual(cursor.execute.call_args.args[1], [Ticket._meta.db_table])
+
+    def test_filtered_count_uses_planner_estimate(self):
+        queryset = Ticket.objects.filter(status="open")
+        for output in ('{"Plan": {"Plan Rows": 250000}}', '[{"Plan": {"Plan Rows": 250000}}]'):
+            with self.subTest(output=output), mock.patch.object(
+                type(queryset), "explain", return_value=output
+            ) as explain:
+                self.assertEqual(self.count(queryset), 250_000)
+                explain.assert_called_once_with(format="json")
+
+
+class BenchAdminChangelistCommandTests(TestCase):
+    def bench(self, *args):
+        call_command("bench_admin_changelist", "--tickets=1000", "--repeat=1", *args, stdout=io.StringIO())
+
+    def test_requires_write_data_flag(self):
+        with self.assertRaisesMessage(CommandError, "--write-data"):
+            self.bench()
+
+        self.assertFalse(User.objects.exists())
+
+    def test_refuses_database_with_tickets_unless_forced(self):
+        requester = User.objects.create_user(username="someone")
+        Ticket.objects.create(title="real ticket", requester=requester)
+
+        with self.assertRaisesMessage(CommandError, "already has tickets"):
+            self.bench("--write-data")
+        self.bench("--write-data", "--force")
+
+        self.assertEqual(list(Ticket.objects.values_list("title", flat=True)), ["real ticket"])
+
+    def test_removes_bench_rows_afterwards(self):
+        self.bench("--write-data")
+
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+
+def throttle_rates(**rates):
+    defaults = {
+        "ip": "1000/min",
+        "user": "1000/min",
+        "token": "1000/min",
+        "token_all": "1000/min",
+        "tickets": "1000/min",
+    }
+    return override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {**defaults, **rates}}
+    )
+
+
+@throttle_rates(user="2/min")
+class TokenBucketThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="bucket")
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        self.request = Request(APIRequestFactory().get("/api/tickets/"))
+        self.request.user = self.user
+
+    def allowed(self):
+        with mock.patch.object(TokenBucketThrottle, "timer", lambda _: self.now):
+            throttle = UserTokenBucketThrottle()
+            return throttle.allow_request(self.request, None), throttle
+
+    def test_burst_then_refill(self):
+        self.assertTrue(self.allowed()[0])
+        self.assertTrue(self.allowed()[0])
+        allowed, throttle = self.allowed()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 30, delta=1)
+
+        self.now += 30
+        self.assertTrue(self.allowed()[0])
+        self.assertFalse(self.allowed()[0])
+
+    def test_idle_bucket_is_capped_at_capacity(self):
+        self.allowed()
+        self.now += 3600
+
+        results = [self.allowed()[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+
+    def test_concurrent_requests_after_idle_gap_do_not_overdraw(self):
+        self.allowed()
+        self.now += 3600
+        barrier = threading.Barrier(4)
+        results = []
+
+        def take():
+            throttle = UserTokenBucketThrottle()
+            barrier.wait(timeout=5)
+            results.append(throttle.allow_request(self.request, None))
+
+        with mock.patch.object(TokenBucketThrottle, "timer", lambda _: self.now):
+            threads = [threading.Thread(target=take) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sorted(results), [False, False, True, True])
+        self.now += 30
+        self.assertTrue(self.allowed()[0])
+        self.assertFalse(self.allowed()[0])
+
+
+@throttle_rates(user="2/min")
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://redis:6379/0"}
+})
+class RedisTokenBucketThrottleTests(SimpleTestCase):
+    """The Redis path, against a mocked client: what goes to the Lua script and how replies are read."""
+
+    def setUp(self):
+        self.client = mock.Mock()
+        self.script = self.client.register_script.return_value
+        patcher = mock.patch(
+            "django.core.cache.backends.redis.RedisCacheClient.get_client", return_value=self.client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def take_token(self, now):
+        throttle = UserTokenBucketThrottle()
+        throttle.key = "throttle:user:7"
+        return throttle.take_token(now)
+
+    def test_script_registered_once_and_called_with_bucket(self):
+        self.script.side_effect = [[1, b"0.5"], [0, b"29.5"]]
+
+        self.assertEqual(self.take_token(1000.0), (True, 0.5))
+        self.assertEqual(self.take_token(1000.25), (False, 29.5))
+
+        self.client.register_script.assert_called_once_with(TAKE_TOKEN_LUA)
+        key = caches["default"].make_and_validate_key("throttle:user:7")
+        self.assertEqual(self.script.call_args_list, [
+            mock.call(keys=[key], args=[2, repr(2 / 60), "1000.0", 60]),
+            mock.call(keys=[key], args=[2, repr(2 / 60), "1000.25", 60]),
+        ])
+
+
+class ThrottledEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username="ops", password="Secret@12345", is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+
+    @throttle_rates(token="2/min")
+    def test_token_endpoint_returns_retry_after(self):
+        client = APIClient()
+        for _ in range(2):
+            client.post("/api/token/", {"username": "ops", "password": "wrong"}, format="json")
+
+        response = client.post("/api/token/", {"username": "ops", "password": "wrong"}, format="json")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+
+    @throttle_rates(token="2/min")
+    def test_forwarded_for_header_does_not_pick_the_bucket(self):
+        client = APIClient()
+        statuses = [
+            client.post(
+                "/api/token/",
+                {"username": "ops", "password": "wrong"},
+                format="json",
+                HTTP_X_FORWARDED_FOR=f"203.0.113.{i}",
+            ).status_code
+            for i in range(3)
+        ]
+
+        self.assertEqual(statuses, [401, 401, 429])
+
+    @throttle_rates(token_all="2/min")
+    def test_token_endpoint_bucket_is_shared_across_clients(self):
+        client = APIClient()
+        statuses = [
+            client.post(
+                "/api/token/",
+                {"username": "ops", "password": "wrong"},
+                format="json",
+                REMOTE_ADDR=f"203.0.113.{i}",
+            ).status_code
+            for i in range(3)
+        ]
+
+        self.assertEqual(statuses, [401, 401, 429])
+
+    @throttle_rates(tickets="1/min")
+    def test_metrics_count_throttled_requests(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        client.get("/api/tickets/")
+        client.get("/api/tickets/")
+
+        response = client.get("/api/throttle-metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["scopes"]["tickets"], {"rate": "1/min", "throttled": 1})
+
+    def test_metrics_require_staff(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="agent"))
+
+        self.assertEqual(client.get("/api/throttle-metrics/").status_code, 403)
+
+
+@override_settings(COMPRESS_MIN_SIZE=1024)
+class ResponseEncodingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username="encoder", is_staff=True)
+        Ticket.objects.bulk_create(
+            Ticket(title=f"Packet loss #{i}", description="Check uplink errors.", requester=cls.staff)
+            for i in range(50)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_gzip_and_brotli_are_negotiated(self):
+        plain = self.client.get("/api/tickets/")
+        gzipped = self.client.get("/api/tickets/", HTTP_ACCEPT_ENCODING="gzip")
+        brotlied = self.client.get("/api/tickets/", HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(gzipped["Content-Encoding"], "gzip")
+        self.assertEqual(brotlied["Content-Encoding"], "br")
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+        self.assertEqual(brotli.decompress(brotlied.content), plain.content)
+        self.assertIn("Accept-Encoding", brotlied["Vary"])
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get("/api/me/", HTTP_ACCEPT_ENCODING="br")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_ticket_list_as_messagepack(self):
+        response = self.client.get("/api/tickets/", HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        tickets = msgpack.unpackb(response.content)
+        self.assertEqual(len(tickets), 50)
+        self.assertEqual(tickets[0]["requester_username"], "encoder")
+
+    def test_ticket_create_from_messagepack(self):
+        response = self.client.post(
+            "/api/tickets/",
+            msgpack.packb({"title": "ONT offline", "priority": "high"}),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Ticket.objects.filter(title="ONT offline", priority="high").exists())
+
+    def test_invalid_messagepack_body_is_rejected(self):
+        response = self.client.post("/api/tickets/", b"\xc1", content_type="application/msgpack")
+
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+        }
+    )
+    def test_messagepack_follows_current_renderer_settings(self):
+        html = self.client.get("/api/tickets/", HTTP_ACCEPT="text/html")
+        packed = self.client.get("/api/users/", HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(html.status_code, 406)
+        self.assertEqual(packed["Content-Type"], "application/msgpack")
@@ -0,0 +1,201 @@
+import math
+import threading
+import weakref
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+# Refill the bucket up to ARGV[3] (now) and try to take one token, in one
+# atomic step on the Redis server. Returns {allowed, seconds until a token}.
+# Floats travel as strings because Redis truncates Lua numbers to integers.
+TAKE_TOKEN_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call("HMGET", KEYS[1], "tokens", "at")
+local tokens = tonumber(state[1]) or capacity
+local at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * refill_rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "at", tostring(now))
+redis.call("EXPIRE", KEYS[1], tonumber(ARGV[4]))
+return {allowed, tostring((1 - tokens) / refill_rate)}
+"""
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket stored in Django's cache.
+
+    A rate of "N/period" is a bucket of N tokens refilled at N per period, so
+    short bursts up to N are allowed. Each bucket stores its token count and
+    when it was last counted. The refill and the take happen as one atomic
+    step: a Lua script on Redis, or under a lock for the other backends. The
+    lock only covers one process, which is exact for the local-memory cache.
+    A bucket idle for a whole period is full, so keys expire after one period.
+    """
+
+    cache_alias = "default"
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    metrics_format = "throttle:throttled:%(scope)s"
+    lock = threading.Lock()
+    # Registered Lua script for each Redis cache client (one per connection pool).
+    redis_scripts = weakref.WeakKeyDictionary()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_rate(self):
+        # Read the rates on every instantiation (not once at import) so
+        # override_settings and settings reloads take effect.
+        if not getattr(self, "scope", None):
+            msg = f"You must set either `.scope` or `.rate` for '{self.__class__.__name__}' throttle"
+            raise ImproperlyConfigured(msg)
+
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            msg = f"No default throttle rate set for '{self.scope}' scope"
+            raise ImproperlyConfigured(msg)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = self.take_token(self.timer())
+        if not allowed:
+            return self.throttle_failure()
+        return True
+
+    def take_token(self, now):
+        """Refill the bucket up to `now` and take a token: (allowed, wait seconds)."""
+        cache = self.cache
+        refill_rate = self.num_requests / self.duration
+        if isinstance(cache, RedisCache):
+            return self.take_token_redis(cache, now, refill_rate)
+
+        with self.lock:
+            tokens, at = cache.get(self.key) or (self.num_requests, now)
+            tokens = min(self.num_requests, tokens + max(0.0, now - at) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            cache.set(self.key, (tokens, now), self.duration)
+        return allowed, (1 - tokens) / refill_rate
+
+    def take_token_redis(self, cache, now, refill_rate):
+        allowed, wait = self.redis_script(cache)(
+            keys=[cache.make_and_validate_key(self.key)],
+            args=[self.num_requests, repr(refill_rate), repr(now), math.ceil(self.duration)],
+        )
+        return bool(int(allowed)), float(wait)
+
+    def redis_script(self, cache):
+        # Django's RedisCache has no public API for scripts, so this is the one
+        # place that uses its client. The Script keeps the client and the
+        # script's SHA, so later calls are a single EVALSHA.
+        cache_client = cache._cache
+        script = self.redis_scripts.get(cache_client)
+        if script is None:
+            script = cache_client.get_client(write=True).register_script(TAKE_TOKEN_LUA)
+            self.redis_scripts[cache_client] = script
+        return script
+
+    def throttle_failure(self):
+        cache = self.cache
+        key = self.metrics_format % {"scope": self.scope}
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Per client IP, for every request (scope "ip")."""
+
+    scope = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Per authenticated user (scope "user"). Anonymous requests are left to the IP throttle."""
+
+    scope = "user"
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Per endpoint: views opt in with `throttle_scope`, and each user (or IP,
+    when anonymous) gets a separate bucket for that scope.
+    """
+
+    scope_attr = "throttle_scope"
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class EndpointTokenBucketThrottle(ScopedTokenBucketThrottle):
+    """
+    One bucket per endpoint shared by all clients: views opt in with
+    `endpoint_throttle_scope`. Caps total load on expensive endpoints even
+    when requests are spread over many IPs or accounts.
+    """
+
+    scope_attr = "endpoint_throttle_scope"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": "all"}
+
+
+def throttle_metrics():
+    """Configured rate and number of throttled requests for each scope."""
+    rates = api_settings.DEFAULT_THROTTLE_RATES
+    keys = {scope: TokenBucketThrottle.metrics_format % {"scope": scope} for scope in rates}
+    counts = caches[TokenBucketThrottle.cache_alias].get_many(keys.values())
+    return {
+        scope: {"rate": rate, "throttled": counts.get(keys[scope], 0)}
+        for scope, rate in rates.items()
+    }
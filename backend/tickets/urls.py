@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import TicketViewSet, UserListView
+from .views import ThrottleMetricsView, TicketViewSet, UserListView
 from .me import me
 
 
@@ -11,5 +11,6 @@ router.register(r"tickets", TicketViewSet, basename="tickets")
 urlpatterns = [
     path("me/", me,),
     path("users/", UserListView.as_view(), name="users-list"),
+    path("throttle-metrics/", ThrottleMetricsView.as_view(), name="throttle-metrics"),
     path("", include(router.urls)),
 ]
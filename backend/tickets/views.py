@@ -1,19 +1,50 @@
 from django.db.models import Q
 from rest_framework import viewsets
 from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from config.db_router import replica_reads
 
 from .models import Ticket
+from .parsers import MessagePackParser
 from .permissions import IsRequesterOrAssigneeOrStaff
+from .renderers import MessagePackRenderer
 from .serializers import TicketSerializer, UserSummarySerializer
+from .throttling import throttle_metrics
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+class ReplicaReadMixin:
+    """Serve safe (read-only) requests from a read replica when configured."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            with replica_reads():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class CompactEncodingMixin:
+    """Offer MessagePack next to the default JSON renderers and parsers."""
+
+    # Built per request (not as class attributes) so REST_FRAMEWORK changes
+    # such as override_settings still apply to these views.
+    def get_renderers(self):
+        return [renderer() for renderer in (*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer)]
+
+    def get_parsers(self):
+        return [parser() for parser in (*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser)]
+
+
+class TicketViewSet(CompactEncodingMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated, IsRequesterOrAssigneeOrStaff]
+    throttle_scope = "tickets"
 
     def get_queryset(self):
         user = self.request.user
@@ -28,7 +59,14 @@ class TicketViewSet(viewsets.ModelViewSet):
         serializer.save(requester=self.request.user)
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(CompactEncodingMixin, ReplicaReadMixin, generics.ListAPIView):
     serializer_class = UserSummarySerializer
     permission_classes = [IsAuthenticated]
     queryset = User.objects.order_by("username")
+
+
+class ThrottleMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"scopes": throttle_metrics()})